@@ -0,0 +1,7 @@
+"""
+Django settings used when running the test suite against Postgres in CI.
+"""
+from app import settings
+from app.settings_test import *  # noqa: F401,F403
+
+DATABASES = settings.DATABASES
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+def merge_duplicate_names(apps, schema_editor):
+    """Merge tags and ingredients sharing a (user, name) into the oldest row"""
+    Recipe = apps.get_model('core', 'Recipe')
+    relations = (('Tag', 'tags'), ('Ingredient', 'ingredient'))
+    for model_name, relation in relations:
+        model = apps.get_model('core', model_name)
+        duplicates = model.objects.order_by().values('user', 'name').annotate(
+            keep_id=models.Min('id'),
+            total=models.Count('id'),
+        ).filter(total__gt=1)
+        for duplicate in duplicates:
+            keep = model.objects.get(id=duplicate['keep_id'])
+            stale = model.objects.filter(
+                user=duplicate['user'], name=duplicate['name'],
+            ).exclude(id=keep.id)
+            recipes = Recipe.objects.filter(
+                **{f'{relation}__in': stale}
+            ).distinct()
+            for recipe in recipes:
+                getattr(recipe, relation).add(keep)
+            stale.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_recipe_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_names, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-15 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0006_merge_duplicate_tag_ingredient_names'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'name'), name='unique_tag_user_name'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='ingredient',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'name'), name='unique_ingredient_user_name'
+            ),
+        ),
+    ]
@@ -72,6 +72,14 @@ class Tag(models.Model):
     """Tag for filtering recipes."""
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'], name='unique_tag_user_name'
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -81,5 +89,12 @@ class Ingredient(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'], name='unique_ingredient_user_name'
+            ),
+        ]
+
     def __str__(self):
         return self.name
\ No newline at end of file
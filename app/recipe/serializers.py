@@ -1,11 +1,33 @@
 """
 Serializer for Recipe API
 """
+from operator import attrgetter
+
+from django.db import transaction
 from rest_framework import serializers
 
 from core.models import Recipe, Tag, Ingredient
 
 
+def _validate_unique_name(serializer, model, name):
+    """Reject a name the authenticated user already uses for another object"""
+    if serializer.parent is not None:
+        # Nested in a recipe payload, where existing names are reused.
+        return name
+    existing = model.objects.filter(
+        user=serializer.context['request'].user, name=name
+    )
+    if serializer.instance is not None:
+        existing = existing.exclude(id=serializer.instance.id)
+    if existing.exists():
+        raise serializers.ValidationError(
+            f'{model._meta.verbose_name.capitalize()} with this name '
+            'already exists.'
+        )
+
+    return name
+
+
 class IngredientSerializer(serializers.ModelSerializer):
     """Serializer for Ingredient object"""
 
@@ -13,7 +35,10 @@ class IngredientSerializer(serializers.ModelSerializer):
         model = Ingredient
         fields = ['id', 'name']
         read_only_fields = ['id']
-        
+
+    def validate_name(self, value):
+        """Ensure the ingredient name is unique for the user"""
+        return _validate_unique_name(self, Ingredient, value)
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -24,6 +49,10 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
         read_only_fields = ['id']
 
+    def validate_name(self, value):
+        """Ensure the tag name is unique for the user"""
+        return _validate_unique_name(self, Tag, value)
+
 
 class RecipeSerializer(serializers.ModelSerializer):
     """Serializer for Recipe object"""
@@ -37,29 +66,36 @@ class RecipeSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
-    def _get_or_create_ingredients(self, ingredients, recipe):
-        """Helper method to get or create existing ingredients"""
+    def _bulk_get_or_create(self, model, items):
+        """Return user owned objects for the given names, creating missing"""
         auth_user = self.context['request'].user
-        for ingredient in ingredients:
-            ingredient_obj, created = Ingredient.objects.get_or_create(
-                user = auth_user,
-                **ingredient
+        names = {item['name'] for item in items}
+        objs = list(model.objects.filter(user=auth_user, name__in=names))
+        missing = names - {obj.name for obj in objs}
+        if missing:
+            model.objects.bulk_create(
+                [model(user=auth_user, name=name) for name in missing],
+                ignore_conflicts=True,
             )
-            recipe.ingredient.add(ingredient_obj)
+            objs += list(
+                model.objects.filter(user=auth_user, name__in=missing)
+            )
+
+        return objs
+
+    def _get_or_create_ingredients(self, ingredients, recipe):
+        """Helper method to get or create existing ingredients"""
+        recipe.ingredient.add(
+            *self._bulk_get_or_create(Ingredient, ingredients)
+        )
 
         return recipe
-         
 
     def _get_or_create_tags(self, tags, recipe):
         """handle getting or creating tags as needed."""
-        auth_user =  self.context['request'].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user = auth_user, 
-                **tag
-            )
-            recipe.tags.add(tag_obj)
+        recipe.tags.add(*self._bulk_get_or_create(Tag, tags))
 
+    @transaction.atomic
     def create(self,validated_data):
         """creating a recipe"""
         tags = validated_data.pop('tags', [])
@@ -70,16 +106,17 @@ class RecipeSerializer(serializers.ModelSerializer):
         self._get_or_create_ingredients(ingredient, recipe)
         return recipe
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         """update a recipe"""
         tags = validated_data.pop('tags', [])
         ingredient = validated_data.pop('ingredient', [])
         if tags is not None:
-            instance.tags.clear()
-            self._get_or_create_tags(tags, instance)
+            instance.tags.set(self._bulk_get_or_create(Tag, tags))
         if ingredient is not None:
-            instance.ingredient.clear()
-            self._get_or_create_ingredients(ingredient, instance)
+            instance.ingredient.set(
+                self._bulk_get_or_create(Ingredient, ingredient)
+            )
         
         
         for attr, value in validated_data.items():
@@ -89,6 +126,40 @@ class RecipeSerializer(serializers.ModelSerializer):
         return instance
 
 
+# The price field ModelSerializer builds from Recipe.price, so the list
+# fast path quantizes and formats prices exactly like RecipeSerializer.
+_PRICE_FIELD = RecipeSerializer().fields['price']
+
+
+class RecipeListSerializer(serializers.ModelSerializer):
+    """Read only serializer for the recipe list"""
+    tags = TagSerializer(many=True, read_only=True)
+    ingredient = IngredientSerializer(many=True, read_only=True)
+
+    _FIELDS = (
+        ('id', attrgetter('id')),
+        ('title', attrgetter('title')),
+        ('time_minutes', attrgetter('time_minutes')),
+        ('price', lambda obj: _PRICE_FIELD.to_representation(obj.price)),
+        ('link', attrgetter('link')),
+        ('tags', lambda obj: [
+            {'id': tag.id, 'name': tag.name} for tag in obj.tags.all()
+        ]),
+        ('ingredient', lambda obj: [
+            {'id': ingredient.id, 'name': ingredient.name}
+            for ingredient in obj.ingredient.all()
+        ]),
+    )
+
+    class Meta:
+        model = Recipe
+        fields = RecipeSerializer.Meta.fields
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        """Build the row from precompiled getters, skipping DRF fields"""
+        return {name: getter(instance) for name, getter in self._FIELDS}
+
 
 class RecipeDetailSerializer(RecipeSerializer):
     """Serializer for Recipe detail"""
@@ -17,10 +17,13 @@ from recipe.tests.test_tags_api import create_user
 
 
 INGREDIENT_URL = reverse('recipe:ingredient-list')
+INGREDIENT_DETAIL_URL_TEMPLATE = reverse(
+    'recipe:ingredient-detail', args=[0]
+).replace('/0/', '/%s/')
 
 def detail_url(id):
     """create and return a detail url for ingredient"""
-    return reverse('recipe:ingredient-detail', args=[id])
+    return INGREDIENT_DETAIL_URL_TEMPLATE % id
 
 
 class PublicIngredientApiTests(TestCase):
@@ -36,10 +39,13 @@ class PublicIngredientApiTests(TestCase):
 
 class PrivateIngredientApitest(TestCase):
     """Test unauthenticated api requests"""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
 
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrive_ingredient(self):
@@ -77,14 +83,33 @@ class PrivateIngredientApitest(TestCase):
         ingredient.refresh_from_db()
         self.assertEqual(ingredient.name, payload['name'])
 
+    def test_update_ingredient_duplicate_name_error(self):
+        """Test renaming an ingredient to an existing name returns an error"""
+        Ingredient.objects.create(user=self.user, name='Spinach')
+        ingredient = Ingredient.objects.create(user=self.user, name='Kale')
+        payload = {'name': 'Spinach'}
+        url = detail_url(ingredient.id)
+        res = self.client.patch(url, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        ingredient.refresh_from_db()
+        self.assertEqual(ingredient.name, 'Kale')
+
     def test_delete_ingredient(self):
         """Test deleting an ingredient"""
         ingredient = Ingredient.objects.create(user=self.user, name='Kale')
+        other_ingredient = Ingredient.objects.create(
+            user=self.user, name='Salt'
+        )
         url = detail_url(ingredient.id)
         res = self.client.delete(url)
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        ingredient = Ingredient.objects.filter(user = self.user)
-        self.assertFalse(ingredient.exists())
+        remaining = set(
+            Ingredient.objects.filter(
+                user=self.user
+            ).values_list('id', flat=True)
+        )
+        self.assertEqual(remaining, {other_ingredient.id})
 
     def test_filter_ingredients_assign_to_recipe(self):
         """Test filtering ingredients by those assigned to a recipe"""
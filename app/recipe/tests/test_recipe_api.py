@@ -2,26 +2,43 @@
 Tests for recipe APIs.
 """
 from decimal import Decimal
-import tempfile
+from io import BytesIO
 import os
+from types import SimpleNamespace
 from PIL import Image
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from core.models import Recipe, Tag, Ingredient
-from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
+from recipe.serializers import (
+    RecipeSerializer,
+    RecipeListSerializer,
+    RecipeDetailSerializer,
+)
 
 RECIPE_URL = reverse('recipe:recipe-list')
 
+_image_buffer = BytesIO()
+Image.new('RGB', (10, 10)).save(_image_buffer, format='JPEG')
+SAMPLE_JPEG = _image_buffer.getvalue()
+
+RECIPE_UPLOAD_IMAGE_URL_TEMPLATE = reverse(
+    'recipe:recipe-upload-image', args=[0]
+).replace('/0/', '/%s/')
+RECIPE_DETAIL_URL_TEMPLATE = reverse(
+    'recipe:recipe-detail', args=[0]
+).replace('/0/', '/%s/')
+
 def image_upload_url(recipe_id):
     """Return URL for recipe image upload"""
-    return reverse('recipe:recipe-upload-image', args=[recipe_id])
+    return RECIPE_UPLOAD_IMAGE_URL_TEMPLATE % recipe_id
 
 def detail_url(recipe_id):
     """Return recipe detail URL."""
-    return reverse('recipe:recipe-detail', args=[recipe_id])
+    return RECIPE_DETAIL_URL_TEMPLATE % recipe_id
 
 def create_recipe(user, **params):
     """Create a recipe with given parameters."""
@@ -59,13 +76,16 @@ class PublicRecipeAPITests(TestCase):
 
 class PrivateRecipeAPITest(TestCase):
     """Test authenticated recipe API access."""
+    client_class = APIClient
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             'testuser',
             'testpass'
         )
+
+    def setUp(self):
         self.client.force_authenticate(self.user)
 
     def test_retrive_recipe(self):
@@ -73,7 +93,9 @@ class PrivateRecipeAPITest(TestCase):
         create_recipe(user=self.user)
         create_recipe(user=self.user)
 
-        res = self.client.get(RECIPE_URL)
+        # recipes, tags and ingredients: one query each
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL)
 
         recipes = Recipe.objects.all().order_by('-id')
         serializer = RecipeSerializer(recipes, many=True)
@@ -103,6 +125,23 @@ class PrivateRecipeAPITest(TestCase):
         serializer = RecipeDetailSerializer(recipe)
         self.assertEqual(res.data, serializer.data)  
         
+    def test_list_serializer_matches_recipe_serializer(self):
+        """Test the list fast path renders like RecipeSerializer"""
+        recipe = create_recipe(user=self.user, price=Decimal('5.5'))
+        recipe.tags.add(Tag.objects.create(user=self.user, name='Vegan'))
+        recipe.ingredient.add(
+            Ingredient.objects.create(user=self.user, name='Salt')
+        )
+
+        self.assertEqual(
+            [name for name, _ in RecipeListSerializer._FIELDS],
+            RecipeSerializer.Meta.fields,
+        )
+        self.assertEqual(
+            RecipeListSerializer(recipe).data,
+            RecipeSerializer(recipe).data,
+        )
+
     def test_create_recipe(self):
         """Test creating a new recipe."""
         payload = {
@@ -171,23 +210,33 @@ class PrivateRecipeAPITest(TestCase):
     def test_delete_recipe(self):
         """Test deleting a recipe"""
         recipe = create_recipe(user = self.user)
+        other_recipe = create_recipe(user=self.user)
+        ids = [recipe.id, other_recipe.id]
 
         url = detail_url(recipe.id)
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(Recipe.objects.filter(id=recipe.id).exists())
+        remaining = set(
+            Recipe.objects.filter(id__in=ids).values_list('id', flat=True)
+        )
+        self.assertEqual(remaining, {other_recipe.id})
 
     def test_delete_recipe_other_user_recipe_user(self):
         """Test trying to delete other's recipe gives error"""
         new_user = create_user(email='user2example.com', password='test123')
         recipe = create_recipe(user=new_user)
+        own_recipe = create_recipe(user=self.user)
+        ids = [recipe.id, own_recipe.id]
 
         url = detail_url(recipe.id)
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
+        remaining = set(
+            Recipe.objects.filter(id__in=ids).values_list('id', flat=True)
+        )
+        self.assertEqual(remaining, set(ids))
 
     def test_create_recipe_with_new_tag(self):
         """Test creating a new tag"""
@@ -200,9 +249,7 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.post(RECIPE_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipe = Recipe.objects.filter(user = self.user)
-        self.assertEqual(recipe.count(), 1)
-        recipe = recipe[0]
+        recipe = Recipe.objects.get(user=self.user)
         self.assertEqual(recipe.tags.count(), 2)
         for tag in payload['tags']:
             exists = recipe.tags.filter(
@@ -223,9 +270,7 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.post(RECIPE_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipe = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipe.count(), 1)
-        recipe = recipe[0]
+        recipe = Recipe.objects.get(user=self.user)
         self.assertEqual(recipe.tags.count(), 2)
         self.assertIn(tag, recipe.tags.all())
         for tag in payload['tags']:
@@ -235,6 +280,20 @@ class PrivateRecipeAPITest(TestCase):
             ).exists()
             self.assertTrue(exists)
 
+    def test_bulk_get_or_create_dedupes_names(self):
+        """Test duplicate names resolve to one object in three queries"""
+        serializer = RecipeSerializer(
+            context={'request': SimpleNamespace(user=self.user)}
+        )
+        items = [{'name': 'Thai'}, {'name': 'Thai'}]
+
+        # existing rows, bulk insert of the missing ones, re-read
+        with self.assertNumQueries(3):
+            tags = serializer._bulk_get_or_create(Tag, items)
+
+        self.assertEqual(len(tags), 1)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+
     def text_create_tag_on_update(self):
         """Test updating a recipe with a new tag"""
         recipe = create_recipe(user = self.user)
@@ -286,9 +345,7 @@ class PrivateRecipeAPITest(TestCase):
             }
         res = self.client.post(RECIPE_URL, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipe = Recipe.objects.filter(user = self.user)
-        self.assertEqual(recipe.count(), 1)
-        recipe = recipe[0]
+        recipe = Recipe.objects.get(user=self.user)
         self.assertEqual(recipe.ingredient.count(), 2)
         for ingredient in payload['ingredient']:
             exist = recipe.ingredient.filter(
@@ -309,9 +366,7 @@ class PrivateRecipeAPITest(TestCase):
             }
         res = self.client.post(RECIPE_URL, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipe = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipe.count(), 1)
-        recipe = recipe[0]
+        recipe = Recipe.objects.get(user=self.user)
         self.assertEqual(recipe.ingredient.count(), 2)
         self.assertIn(ingredient, recipe.ingredient.all())
         for ingredient in payload['ingredient']:
@@ -416,13 +471,12 @@ class ImageUploadTests(TestCase):
     def test_upload_image(self):
         """Test uploading an image to a recipe"""
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
-            img = Image.new('RGB',(10,10))
-            img.save(image_file, format='JPEG')
-            image_file.seek(0)
-            payload = {'image':image_file}
-            res = self.client.post(url, payload, format='multipart')
-        
+        image_file = SimpleUploadedFile(
+            'image.jpg', SAMPLE_JPEG, content_type='image/jpeg'
+        )
+        payload = {'image': image_file}
+        res = self.client.post(url, payload, format='multipart')
+
         self.recipe.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn('image', res.data)
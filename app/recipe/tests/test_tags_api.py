@@ -15,10 +15,13 @@ from recipe.serializers import TagSerializer
 
 
 TAGS_URL = reverse('recipe:tag-list')
+TAG_DETAIL_URL_TEMPLATE = reverse(
+    'recipe:tag-detail', args=[0]
+).replace('/0/', '/%s/')
 
 def detail_url(tag_id):
     """create and return the tag url"""
-    return reverse('recipe:tag-detail', args=[tag_id])
+    return TAG_DETAIL_URL_TEMPLATE % tag_id
 
 def create_user(email='user@example.com', password='testpass123'):
     """create and return a user"""
@@ -39,10 +42,13 @@ class PublicTagsApiTests(TestCase):
 
 class PrivateTagsApiTests(TestCase):
     """Test anuthenticated API requests."""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
 
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrive_tags(self):
@@ -81,16 +87,31 @@ class PrivateTagsApiTests(TestCase):
         tag.refresh_from_db()
         self.assertEqual(tag.name, payload['name'])
     
+    def test_update_tag_duplicate_name_error(self):
+        """Test renaming a tag to an existing name returns an error"""
+        Tag.objects.create(user=self.user, name='Dessert')
+        tag = Tag.objects.create(user=self.user, name='after dinner')
+        payload = {'name': 'Dessert'}
+        url = detail_url(tag.id)
+        res = self.client.patch(url, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, 'after dinner')
+
     def test_delete_tag(self):
         """test deleting a tag"""
         tag = Tag.objects.create(user = self.user, name='after dinner')
+        other_tag = Tag.objects.create(user=self.user, name='breakfast')
         url = detail_url(tag.id)
 
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        tag = Tag.objects.filter(user = self.user)
-        self.assertFalse(tag.exists())
+        remaining = set(
+            Tag.objects.filter(user=self.user).values_list('id', flat=True)
+        )
+        self.assertEqual(remaining, {other_tag.id})
 
     def test_filter_tag_assigned_to_recipes(self):
         """Test filtering tags by those assigned to recipes"""
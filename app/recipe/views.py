@@ -7,6 +7,7 @@ from drf_spectacular.utils import(
     OpenApiParameter,
     OpenApiTypes,
 )
+from django.db.models import Count, Prefetch
 from rest_framework import viewsets, mixins, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -56,12 +57,32 @@ class RecipeViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(ingredient__id__in=ingredients_ids)
             
 
-        return queryset.filter(user=self.request.user).order_by('-id').distinct()
+        if self.action == 'list':
+            queryset = queryset.only(
+                'id', 'title', 'time_minutes', 'price', 'link', 'user_id'
+            )
+
+        queryset = queryset.filter(
+            user=self.request.user
+        ).order_by('-id').distinct()
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'tags',
+                    queryset=Tag.objects.only('id', 'name', 'user_id'),
+                ),
+                Prefetch(
+                    'ingredient',
+                    queryset=Ingredient.objects.only('id', 'name', 'user_id'),
+                ),
+            )
+
+        return queryset
     
     def get_serializer_class(self):
         """Return the serializer class for this view"""
         if self.action == 'list':
-            return serializers.RecipeSerializer
+            return serializers.RecipeListSerializer
         elif self.action == 'upload_image':
             return serializers.RecipeImageSerializer
         else:
@@ -105,11 +126,24 @@ class TagViewSet(mixins.DestroyModelMixin,mixins.UpdateModelMixin,mixins.ListMod
         assigned_only = bool(
             int(self.request.query_params.get('assigned_only', 0))
         )
-        queryset = self.queryset
+        queryset = self.queryset.filter(user=self.request.user)
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
+            queryset = queryset.annotate(
+                recipe_count=Count('recipe', distinct=True)
+            ).filter(recipe_count__gt=0)
+
+        return queryset.order_by('-name')
+
+    def list(self, request, *args, **kwargs):
+        """List tags as plain id/name rows without building models"""
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).values('id', 'name')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(page))
 
-        return queryset.filter(user = self.request.user).order_by('-name').distinct()
+        return Response(list(queryset))
     
 @extend_schema_view(
     list=extend_schema(
@@ -137,8 +171,21 @@ class IngredientViewSet(mixins.DestroyModelMixin,
         assigned_only = bool(
             int(self.request.query_params.get('assigned_only', 0))
         )
-        queryset = self.queryset
+        queryset = self.queryset.filter(user=self.request.user)
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
+            queryset = queryset.annotate(
+                recipe_count=Count('recipe', distinct=True)
+            ).filter(recipe_count__gt=0)
+
+        return queryset.order_by('-name')
+
+    def list(self, request, *args, **kwargs):
+        """List ingredients as plain id/name rows without building models"""
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).values('id', 'name')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(page))
 
-        return queryset.filter(user = self.request.user).order_by('-name').distinct()
+        return Response(list(queryset))